@@ -1,5 +1,5 @@
 """Document building functionality for texmgr."""
 
-from .build import build_document, cleanup
+from .build import build_document, clean_aux, cleanup
 
-__all__ = ["build_document", "cleanup"]
+__all__ = ["build_document", "clean_aux", "cleanup"]
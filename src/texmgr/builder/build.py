@@ -1,19 +1,239 @@
 """Document build functionality using latexmk."""
 
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Set
 
-from ..utils.errors import BuildError
+from ..utils.errors import BuildError, TexmgrError
 from ..utils.logs import logger
-from ..utils.cmds import run_command, check_command_exists
-from ..utils.fileops import ensure_dir, detect_project_root
+from ..utils.cmds import run_command, run_command_async, check_command_exists
+from ..utils.fileops import ensure_dir, ensure_dirs, detect_project_root, is_empty_dir
+
+# Watch mode: source files that trigger a rebuild and the delay (seconds)
+# used to coalesce bursts of file events into a single latexmk run
+WATCH_SUFFIXES = (".tex", ".bib")
+WATCH_DEBOUNCE = 0.2
+
+# Fixed part of the latexmk command line, and the flags added for -pvc
+LATEXMK_BASE = (
+    "latexmk",
+    "-pdf",                      # Generate PDF output
+    "-interaction=nonstopmode",  # Don't stop for errors
+)
+LATEXMK_WATCH = (
+    "-pvc",                      # Preview continuously (watch mode)
+    "-view=none",                # Don't launch viewer
+)
+
+# Digest of the PDF build inputs, stored in the aux directory after a build
+INPUTS_DIGEST_FILE = ".texmgr_fls_hash"
+
+# \bibdata{a,b} and \bibstyle{s} lines that LaTeX writes to the .aux for bibtex
+BIBTEX_AUX_RE = re.compile(r"^\\bib(data|style)\{([^}]*)\}", re.MULTILINE)
+
+def resolve_project_root(project_root: Optional[Path] = None) -> Path:
+    """
+    Return the project root, detecting it if not given.
+
+    Parameters
+    ----------
+    project_root : Optional[Path], optional
+        Already known project root, by default None
+
+    Returns
+    -------
+    Path
+        Root directory of the project
+
+    Raises
+    ------
+    BuildError
+        If no project root is given and none can be detected
+    """
+    project_root = project_root or detect_project_root()
+    if not project_root:
+        raise BuildError("Not in a LaTeX project directory")
+    return project_root
+
+@dataclass(frozen=True)
+class ProjectLayout:
+    """
+    Project files the builders depend on, discovered in a single pass.
+
+    Attributes
+    ----------
+    root : Path
+        Root directory of the project
+    main_tex : Path
+        Main LaTeX file
+    has_word_template : bool
+        Whether format/template.docx exists
+    has_html_css : bool
+        Whether format/style.css exists
+    """
+
+    root: Path
+    main_tex: Path
+    has_word_template: bool = False
+    has_html_css: bool = False
+
+    @classmethod
+    def discover(cls, root: Path) -> "ProjectLayout":
+        """
+        Build the layout of a project with one scan of its format/ directory.
+
+        Parameters
+        ----------
+        root : Path
+            Root directory of the project
+
+        Returns
+        -------
+        ProjectLayout
+            Layout of the project
+        """
+        try:
+            with os.scandir(root / "format") as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            names = set()
+
+        return cls(
+            root=root,
+            main_tex=root / "main.tex",
+            has_word_template="template.docx" in names,
+            has_html_css="style.css" in names,
+        )
+
+def find_bibtex_inputs(layout: ProjectLayout, aux_dir: str) -> Set[str]:
+    """
+    Find the project's bibliography databases and styles used by bibtex.
 
-def build_pdf(watch: bool = False) -> None:
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+    aux_dir : str
+        Directory holding latexmk's auxiliary files
+
+    Returns
+    -------
+    Set[str]
+        Paths of the .bib and .bst files named by the ``\\bibdata`` and
+        ``\\bibstyle`` entries of the main .aux file that exist in the project
+
+    Notes
+    -----
+    Names that do not resolve inside the project refer to files in the TeX
+    tree, which only change with a TeX Live update, and are left out.
+    """
+    aux_path = os.path.join(aux_dir, f"{layout.main_tex.stem}.aux")
+    try:
+        with open(aux_path, errors="replace") as f:
+            content = f.read()
+    except OSError:
+        return set()
+
+    root = os.fspath(layout.root)
+    paths = set()
+    for kind, names in BIBTEX_AUX_RE.findall(content):
+        suffix = ".bib" if kind == "data" else ".bst"
+        for name in names.split(","):
+            name = name.strip()
+            if not name:
+                continue
+            if not name.endswith(suffix):
+                name += suffix
+            path = os.path.normpath(os.path.join(root, name))
+            if os.path.isfile(path):
+                paths.add(path)
+
+    return paths
+
+def compute_inputs_digest(
+    layout: ProjectLayout, aux_dir: str, started_ns: Optional[int] = None
+) -> Optional[str]:
+    """
+    Hash the sources of the last LaTeX run as recorded in its .fls file.
+
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+    aux_dir : str
+        Directory holding latexmk's auxiliary files
+    started_ns : Optional[int], optional
+        Start of the build in ``time.time_ns()`` units; sources modified at
+        or after it make the digest unusable, by default None
+
+    Returns
+    -------
+    Optional[str]
+        Digest over path, mtime and size of every source listed in the .fls
+        file and every bibliography file bibtex reads, or None if the .fls
+        file is missing, one of the sources no longer exists, or one of them
+        changed while the build was running
+
+    Notes
+    -----
+    Only file metadata is hashed, so the check costs one stat per source.
+    Files the run also wrote (.aux, .toc, ...) and anything under output/
+    are generated on every run and are not sources, so they are skipped.
+    """
+    fls_path = os.path.join(aux_dir, f"{layout.main_tex.stem}.fls")
+    try:
+        with open(fls_path, errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    root = os.fspath(layout.root)
+    output_prefix = os.path.join(root, "output") + os.sep
+    cwd = root
+    inputs = set()
+    outputs = set()
+    for line in lines:
+        if line.startswith("PWD "):
+            cwd = line[4:]
+        elif line.startswith("INPUT "):
+            inputs.add(os.path.normpath(os.path.join(cwd, line[6:])))
+        elif line.startswith("OUTPUT "):
+            outputs.add(os.path.normpath(os.path.join(cwd, line[7:])))
+
+    sources = {
+        path for path in inputs - outputs if not path.startswith(output_prefix)
+    }
+
+    # Bibliographies are read by bibtex, so pdflatex does not record them
+    sources.update(find_bibtex_inputs(layout, aux_dir))
+
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(sources):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        # The PDF may not reflect an edit saved while latexmk was running
+        if started_ns is not None and stat.st_mtime_ns >= started_ns:
+            return None
+        digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+
+    return digest.hexdigest()
+
+async def build_pdf(layout: ProjectLayout, watch: bool = False) -> None:
     """
     Build PDF using latexmk.
 
     Parameters
     ----------
+    layout : ProjectLayout
+        Layout of the project
     watch : bool, optional
         Enable watch mode for automatic rebuilds, by default False
 
@@ -21,57 +241,154 @@ def build_pdf(watch: bool = False) -> None:
     ------
     BuildError
         If build fails or project structure is invalid
+
+    Notes
+    -----
+    Outside watch mode latexmk is skipped entirely when the PDF exists and
+    none of the inputs recorded by the previous build have changed. No
+    digest is recorded if an input was modified during the build, so the
+    next build runs latexmk again.
     """
     if not check_command_exists("latexmk"):
         raise BuildError("latexmk not found. Please ensure it's installed.")
 
-    project_root = detect_project_root()
-    if not project_root:
-        raise BuildError("Not in a LaTeX project directory")
-
-    # Create output directory if it doesn't exist
-    output_dir = project_root / "output" / "pdf"
-    ensure_dir(output_dir)
-
     # Ensure both output directories exist
-    output_dir = project_root / "output" / "pdf"
-    aux_dir = project_root / "output" / "logs"
-    ensure_dir(output_dir)
-    ensure_dir(aux_dir)
+    root = os.fspath(layout.root)
+    output_dir = os.path.join(root, "output", "pdf")
+    aux_dir = os.path.join(root, "output", "logs")
+    ensure_dirs([output_dir, aux_dir])
+
+    digest_file = Path(aux_dir, INPUTS_DIGEST_FILE)
+    pdf_path = os.path.join(output_dir, f"{layout.main_tex.stem}.pdf")
+    if not watch and os.path.exists(pdf_path):
+        digest = compute_inputs_digest(layout, aux_dir)
+        if digest and digest_file.exists() and digest_file.read_text() == digest:
+            logger.info("PDF is up-to-date: %s", pdf_path)
+            return
 
-    # Base latexmk command
     cmd = [
-        "latexmk",
-        "-pdf",                    # Generate PDF output
-        "-interaction=nonstopmode",  # Don't stop for errors
+        *LATEXMK_BASE,
+        *(LATEXMK_WATCH if watch else ()),
         f"-output-directory={output_dir}",  # PDF output directory
         f"-aux-directory={aux_dir}",   # Auxiliary files directory
-        "main.tex"                # Main tex file
+        layout.main_tex.name       # Main tex file
     ]
 
-    if watch:
-        cmd.extend([
-            "-pvc",               # Preview continuously (watch mode)
-            "-view=none"          # Don't launch viewer
-        ])
-
     try:
         logger.info("Building PDF...")
-        run_command(
+        digest_file.unlink(missing_ok=True)
+        started_ns = time.time_ns()
+        await run_command_async(
             cmd,
-            cwd=project_root,
+            cwd=root,
             error_msg="PDF build failed",
             capture_output=not watch  # Show output in real-time for watch mode
         )
         if not watch:
-            logger.info(f"PDF built successfully: {output_dir}/main.pdf")
+            logger.info("PDF built successfully: %s", pdf_path)
+            digest = compute_inputs_digest(layout, aux_dir, started_ns)
+            if digest:
+                digest_file.write_text(digest)
     except Exception as e:
         raise BuildError(f"Failed to build PDF: {str(e)}")
 
-def build_word() -> None:
+async def build_pdf_watch(layout: ProjectLayout) -> None:
+    """
+    Build PDF and rebuild it whenever project sources change.
+
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+
+    Raises
+    ------
+    BuildError
+        If the latexmk -pvc fallback fails
+
+    Notes
+    -----
+    Uses watchdog for event-driven change detection when it is installed,
+    otherwise falls back to latexmk's polling watch mode (-pvc). Each burst
+    of changes to .tex/.bib files outside output/ triggers one rebuild.
+    """
+    try:
+        from watchdog.events import (
+            EVENT_TYPE_CREATED,
+            EVENT_TYPE_MODIFIED,
+            EVENT_TYPE_MOVED,
+            FileSystemEventHandler,
+        )
+        from watchdog.observers import Observer
+    except ImportError:
+        logger.debug("watchdog not installed, using latexmk -pvc")
+        await build_pdf(layout, watch=True)
+        return
+
+    output_dir = layout.root / "output"
+    loop = asyncio.get_running_loop()
+    build_lock = asyncio.Lock()
+    pending: List[asyncio.TimerHandle] = []
+    running = set()  # keeps in-flight rebuild tasks referenced
+
+    async def rebuild() -> None:
+        async with build_lock:
+            try:
+                await build_pdf(layout)
+            except TexmgrError as e:
+                logger.error("%s", e)
+
+    def start_rebuild() -> None:
+        pending.clear()
+        task = loop.create_task(rebuild())
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    def schedule_rebuild() -> None:
+        # Restart the debounce timer so only the last event builds
+        if pending:
+            pending.pop().cancel()
+        pending.append(loop.call_later(WATCH_DEBOUNCE, start_rebuild))
+
+    class SourceChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event) -> None:
+            if event.is_directory or event.event_type not in (
+                EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED
+            ):
+                return
+
+            path = Path(event.dest_path or event.src_path)
+            if path.suffix not in WATCH_SUFFIXES or output_dir in path.parents:
+                return
+
+            # Events arrive on the observer thread; builds run on the loop
+            loop.call_soon_threadsafe(schedule_rebuild)
+
+    await rebuild()
+
+    observer = Observer()
+    observer.schedule(SourceChangeHandler(), str(layout.root), recursive=True)
+    observer.start()
+    logger.info("Watching for changes (press Ctrl+C to stop)...")
+
+    try:
+        while observer.is_alive():
+            await asyncio.sleep(1)
+    finally:
+        observer.stop()
+        observer.join()
+        for handle in pending:
+            handle.cancel()
+
+async def build_word(layout: ProjectLayout) -> None:
     """
     Convert LaTeX to Word using pandoc.
 
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+
     Raises
     ------
     BuildError
@@ -80,35 +397,40 @@ def build_word() -> None:
     if not check_command_exists("pandoc"):
         raise BuildError("pandoc not found. Please ensure it's installed.")
 
-    project_root = detect_project_root()
-    if not project_root:
-        raise BuildError("Not in a LaTeX project directory")
-
     # Create output directory if it doesn't exist
-    output_dir = project_root / "output" / "word"
+    root = os.fspath(layout.root)
+    output_dir = os.path.join(root, "output", "word")
     ensure_dir(output_dir)
 
+    cmd = [
+        "pandoc",
+        layout.main_tex.name,
+        "-o", os.path.join(output_dir, "main.docx"),
+        "--resource-path", ".",
+    ]
+    if layout.has_word_template:
+        cmd.extend(["--reference-doc", "format/template.docx"])
+
     try:
         logger.info("Converting to Word...")
-        run_command(
-            [
-                "pandoc",
-                "main.tex",
-                "-o", output_dir / "main.docx",
-                "--resource-path", ".",
-                "--reference-doc", "format/template.docx" if (project_root / "format/template.docx").exists() else None
-            ],
-            cwd=project_root,
+        await run_command_async(
+            cmd,
+            cwd=root,
             error_msg="Word conversion failed"
         )
-        logger.info(f"Word document created: {output_dir}/main.docx")
+        logger.info("Word document created: %s/main.docx", output_dir)
     except Exception as e:
         raise BuildError(f"Failed to convert to Word: {str(e)}")
 
-def build_html() -> None:
+async def build_html(layout: ProjectLayout) -> None:
     """
     Convert LaTeX to HTML using pandoc.
 
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+
     Raises
     ------
     BuildError
@@ -117,34 +439,107 @@ def build_html() -> None:
     if not check_command_exists("pandoc"):
         raise BuildError("pandoc not found. Please ensure it's installed.")
 
-    project_root = detect_project_root()
-    if not project_root:
-        raise BuildError("Not in a LaTeX project directory")
-
     # Create output directory if it doesn't exist
-    output_dir = project_root / "output" / "html"
+    root = os.fspath(layout.root)
+    output_dir = os.path.join(root, "output", "html")
     ensure_dir(output_dir)
 
+    cmd = [
+        "pandoc",
+        layout.main_tex.name,
+        "-o", os.path.join(output_dir, "index.html"),
+        "--standalone",
+        "--mathjax",
+        "--resource-path", ".",
+    ]
+    if layout.has_html_css:
+        cmd.extend(["--css", "format/style.css"])
+
     try:
         logger.info("Converting to HTML...")
-        run_command(
-            [
-                "pandoc",
-                "main.tex",
-                "-o", output_dir / "index.html",
-                "--standalone",
-                "--mathjax",
-                "--resource-path", ".",
-                "--css", "format/style.css" if (project_root / "format/style.css").exists() else None
-            ],
-            cwd=project_root,
+        await run_command_async(
+            cmd,
+            cwd=root,
             error_msg="HTML conversion failed"
         )
-        logger.info(f"HTML document created: {output_dir}/index.html")
+        logger.info("HTML document created: %s/index.html", output_dir)
     except Exception as e:
         raise BuildError(f"Failed to convert to HTML: {str(e)}")
 
-def build_document(format: str, watch: bool = False) -> int:
+async def build_all(layout: ProjectLayout) -> None:
+    """
+    Build PDF, Word and HTML outputs concurrently.
+
+    Parameters
+    ----------
+    layout : ProjectLayout
+        Layout of the project
+
+    Raises
+    ------
+    BuildError
+        If any of the builds fails, with the messages of all failed builds
+
+    Notes
+    -----
+    The latexmk and pandoc subprocesses are awaited together on one event
+    loop, so the total time is that of the slowest build.
+    """
+    results = await asyncio.gather(
+        build_pdf(layout),
+        build_word(layout),
+        build_html(layout),
+        return_exceptions=True
+    )
+    errors = [str(result) for result in results if isinstance(result, Exception)]
+
+    if errors:
+        raise BuildError("; ".join(errors))
+
+async def build_document_async(
+    format: str, watch: bool = False, project_root: Optional[Path] = None
+) -> int:
+    """
+    Build document in specified format.
+
+    Parameters
+    ----------
+    format : str
+        Output format ('pdf', 'word', 'html', or 'all')
+    watch : bool, optional
+        Enable watch mode for PDF builds, by default False
+    project_root : Optional[Path], optional
+        Root directory of the project, detected if not given
+
+    Returns
+    -------
+    int
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        layout = ProjectLayout.discover(resolve_project_root(project_root))
+
+        if watch and format in ("pdf", "all"):
+            # Don't continue with other formats in watch mode
+            await build_pdf_watch(layout)
+        elif format == "all":
+            await build_all(layout)
+        elif format == "pdf":
+            await build_pdf(layout)
+        elif format == "word":
+            await build_word(layout)
+        elif format == "html":
+            await build_html(layout)
+
+        return 0
+
+    except Exception as e:
+        logger.error("%s", e)
+        return 1
+
+def build_document(
+    format: str, watch: bool = False, project_root: Optional[Path] = None
+) -> int:
     """
     Build document in specified format.
 
@@ -154,67 +549,137 @@ def build_document(format: str, watch: bool = False) -> int:
         Output format ('pdf', 'word', 'html', or 'all')
     watch : bool, optional
         Enable watch mode for PDF builds, by default False
+    project_root : Optional[Path], optional
+        Root directory of the project, detected if not given
 
     Returns
     -------
     int
         Exit code (0 for success, 1 for failure)
+
+    Notes
+    -----
+    Synchronous wrapper running build_document_async on a new event loop.
     """
     try:
-        if format == "pdf" or format == "all":
-            build_pdf(watch)
-            if watch:  # Don't continue with other formats in watch mode
-                return 0
+        return asyncio.run(
+            build_document_async(format, watch=watch, project_root=project_root)
+        )
+    except KeyboardInterrupt:
+        # Ctrl+C is the normal way to leave watch mode
+        if watch:
+            return 0
+        raise
 
-        if format == "word" or format == "all":
-            build_word()
+def remove_aux_files(project_root: Path) -> None:
+    """
+    Remove LaTeX auxiliary files produced by latexmk.
 
-        if format == "html" or format == "all":
-            build_html()
+    Parameters
+    ----------
+    project_root : Path
+        Root directory of the project
 
+    Raises
+    ------
+    InstallError
+        If latexmk fails
+    """
+    root = os.fspath(project_root)
+    output_dir = os.path.join(root, "output", "pdf")
+    aux_dir = os.path.join(root, "output", "logs")
+
+    # latexmk names every auxiliary file after main.tex; without any there
+    # is nothing to clean and no reason to start perl
+    try:
+        with os.scandir(aux_dir) as entries:
+            if not any(entry.name.startswith("main.") for entry in entries):
+                logger.debug("No auxiliary files to clean")
+                return
+    except FileNotFoundError:
+        return
+
+    # Same directories as the build so latexmk finds its own files
+    run_command(
+        [
+            "latexmk",
+            "-c",
+            f"-output-directory={output_dir}",
+            f"-aux-directory={aux_dir}",
+            "main.tex"
+        ],
+        cwd=project_root,
+        error_msg="Cleanup failed"
+    )
+
+def clean_aux(project_root: Optional[Path] = None) -> int:
+    """
+    Clean up LaTeX auxiliary files, keeping the built documents.
+
+    Parameters
+    ----------
+    project_root : Optional[Path], optional
+        Root directory of the project, detected if not given
+
+    Returns
+    -------
+    int
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        project_root = resolve_project_root(project_root)
+
+        logger.info("Cleaning auxiliary files...")
+        remove_aux_files(project_root)
         return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
 
-def cleanup() -> int:
+def cleanup(deep_clean: bool = False, project_root: Optional[Path] = None) -> int:
     """
     Clean up build artifacts.
 
+    Parameters
+    ----------
+    deep_clean : bool, optional
+        Also remove LaTeX auxiliary files, by default False
+    project_root : Optional[Path], optional
+        Root directory of the project, detected if not given
+
     Returns
     -------
     int
         Exit code (0 for success, 1 for failure)
+
+    Notes
+    -----
+    Auxiliary files (.aux, .bbl, .toc, .fls, ...) in output/logs are kept
+    unless deep_clean is set, so latexmk can skip bibtex and extra passes
+    on the next build.
     """
     try:
-        project_root = detect_project_root()
-        if not project_root:
-            raise BuildError("Not in a LaTeX project directory")
+        project_root = resolve_project_root(project_root)
 
         logger.info("Cleaning build artifacts...")
 
-        # Run latexmk clean
-        run_command(
-            ["latexmk", "-c"],
-            cwd=project_root,
-            error_msg="Cleanup failed"
-        )
+        if deep_clean:
+            remove_aux_files(project_root)
 
-        # Remove output files
-        output_dir = project_root / "output"
-        if output_dir.exists():
+        # Remove output files, including subdirectories such as html/text
+        output_dir = os.path.join(os.fspath(project_root), "output")
+        if os.path.exists(output_dir):
             for fmt_dir in ["pdf", "word", "html"]:
-                fmt_path = output_dir / fmt_dir
-                if fmt_path.exists():
-                    for file in fmt_path.iterdir():
-                        if file.is_file():
-                            file.unlink()
-                            logger.debug(f"Removed {file}")
+                fmt_path = os.path.join(output_dir, fmt_dir)
+                if os.path.isdir(fmt_path) and not is_empty_dir(fmt_path):
+                    shutil.rmtree(fmt_path, ignore_errors=True)
+                    os.makedirs(fmt_path, exist_ok=True)
+                    logger.debug("Removed contents of %s", fmt_path)
 
         logger.info("Cleanup complete")
         return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
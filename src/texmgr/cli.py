@@ -1,10 +1,7 @@
+from __future__ import annotations
+
 import sys
 import argparse
-from pathlib import Path
-from typing import Optional
-
-from .utils.logs import setup_logging
-from .utils.errors import TexmgrError
 
 def create_parser() -> argparse.ArgumentParser:
     """
@@ -88,12 +85,21 @@ def create_parser() -> argparse.ArgumentParser:
     build_parser.add_argument(
         "--watch",
         action="store_true",
-        help="Watch for changes and rebuild (only for PDF)"
+        help=(
+            "Watch for changes and rebuild (only for PDF); install the "
+            "'watch' extra (texmgr[watch]) for event-driven rebuilds"
+        )
+    )
+    build_parser.add_argument(
+        "--deep-clean",
+        action="store_true",
+        help="Remove auxiliary files after build"
     )
+    # Keeping auxiliary files is now the default; accepted for old scripts
     build_parser.add_argument(
         "--keep-logs",
         action="store_true",
-        help="Keep auxiliary files after build"
+        help=argparse.SUPPRESS
     )
 
     # Cleanup command
@@ -101,6 +107,11 @@ def create_parser() -> argparse.ArgumentParser:
         "cleanup",
         help="Clean output directories"
     )
+    cleanup_parser.add_argument(
+        "--deep-clean",
+        action="store_true",
+        help="Also remove auxiliary files"
+    )
 
     # Update command
     update_parser = subparsers.add_parser(
@@ -110,7 +121,7 @@ def create_parser() -> argparse.ArgumentParser:
 
     return parser
 
-def entry_point() -> Optional[int]:
+def entry_point() -> int | None:
     """
     Main entry point for texmgr.
 
@@ -131,9 +142,16 @@ def entry_point() -> Optional[int]:
     - build : Build documents
     - cleanup : Clean output directories
     - update : Update TeX Live and installed packages
+
+    Everything beyond argparse is imported after parsing, so ``--help`` and
+    usage errors exit without loading the rest of the package.
     """
     parser = create_parser()
     args = parser.parse_args()
+
+    from .utils.logs import setup_logging
+    from .utils.errors import TexmgrError
+
     logger = setup_logging(args.verbose)
 
     try:
@@ -151,28 +169,33 @@ def entry_point() -> Optional[int]:
 
         elif args.command == "build":
             from .builder import build_document
-            result = build_document(args.format, watch=args.watch)
-            # Clean up logs if not requested to keep them
-            if result == 0 and not args.keep_logs and not args.watch:
-                from .builder import cleanup
-                cleanup()
+            from .utils.fileops import detect_project_root
+            # Look up the project once for both the build and the clean
+            project_root = detect_project_root()
+            result = build_document(
+                args.format, watch=args.watch, project_root=project_root
+            )
+            # Auxiliary files are kept by default for incremental builds
+            if result == 0 and args.deep_clean and not args.watch:
+                from .builder import clean_aux
+                result = clean_aux(project_root=project_root)
             return result
 
         elif args.command == "cleanup":
             from .builder import cleanup
-            return cleanup()
+            return cleanup(deep_clean=args.deep_clean)
 
         elif args.command == "update":
             from .install import update_texlive
             return update_texlive()
 
     except TexmgrError as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         if args.verbose:
             logger.exception("Detailed traceback:")
         return e.exit_code
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         if args.verbose:
             logger.exception("Detailed traceback:")
         return 1
@@ -1,7 +1,9 @@
 """Configuration and templates for texmgr."""
 
+import sys
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import List, Mapping
 
 # Project directory structure
 PROJECT_DIRS = [
@@ -36,59 +38,59 @@ DEFAULT_PACKAGES = [
 # LaTeX document templates
 TEMPLATES = {
     "article": {
-        "main.tex": """\\documentclass{article}
-\\input{format/preamble}
-\\input{format/title}
-
-\\begin{document}
-    \\maketitle
-    \\tableofcontents
-    \\newpage
-    \\input{text/body}
-    \\input{format/references}
-\\end{document}
+        "main.tex": r"""\documentclass{article}
+\input{format/preamble}
+\input{format/title}
+
+\begin{document}
+    \maketitle
+    \tableofcontents
+    \newpage
+    \input{text/body}
+    \input{format/references}
+\end{document}
 """,
-        "format/packages.tex": """\\usepackage[cmex10]{amsmath}
-\\usepackage{amsthm,amssymb}
-\\usepackage[pdftex]{graphicx}
-\\DeclareGraphicsExtensions{.pdf,.png,.jpg}
-\\usepackage[caption=false]{subfig}
-\\usepackage{booktabs}
-\\usepackage{url}
-\\urlstyle{same}
-\\usepackage{amsmath}
-\\usepackage{float}
-\\usepackage{longtable}
-\\usepackage{caption}
-\\usepackage{subcaption}
-\\usepackage{tikz}
-\\usepackage{textgreek}
-\\usepackage{siunitx}
-\\usepackage{cite}
-\\usepackage{bibtex}
+        "format/packages.tex": r"""\usepackage[cmex10]{amsmath}
+\usepackage{amsthm,amssymb}
+\usepackage[pdftex]{graphicx}
+\DeclareGraphicsExtensions{.pdf,.png,.jpg}
+\usepackage[caption=false]{subfig}
+\usepackage{booktabs}
+\usepackage{url}
+\urlstyle{same}
+\usepackage{amsmath}
+\usepackage{float}
+\usepackage{longtable}
+\usepackage{caption}
+\usepackage{subcaption}
+\usepackage{tikz}
+\usepackage{textgreek}
+\usepackage{siunitx}
+\usepackage{cite}
+\usepackage{bibtex}
 """,
-        "format/preamble.tex": """% Load packages
-\\input{format/packages}
+        "format/preamble.tex": r"""% Load packages
+\input{format/packages}
 
 % Document settings
-\\setlength{\\parindent}{0pt}
-\\setlength{\\parskip}{1em}
+\setlength{\parindent}{0pt}
+\setlength{\parskip}{1em}
 
 % Custom commands and environments
 """,
-        "format/references.tex": """\\bibliographystyle{unsrt}
-\\bibliography{refs}
+        "format/references.tex": r"""\bibliographystyle{unsrt}
+\bibliography{refs}
 """,
-        "format/title.tex": """\\title{Document Title}
-\\author{Author Name}
-\\date{\\today}
+        "format/title.tex": r"""\title{Document Title}
+\author{Author Name}
+\date{\today}
 """,
-        "text/body.tex": """\\section{Introduction}
+        "text/body.tex": r"""\section{Introduction}
 Your content here.
 """,
-        "refs.bib": """% Add your references here
+        "refs.bib": r"""% Add your references here
 """,
-        ".gitignore": """# LaTeX
+        ".gitignore": r"""# LaTeX
 *.aux
 *.bbl
 *.blg
@@ -100,52 +102,52 @@ output/
 """
     },
     "beamer": {
-        "main.tex": """\\documentclass{beamer}
-\\input{format/preamble}
-\\input{format/title}
-
-\\begin{document}
-    \\frame{\\titlepage}
-    \\input{text/body}
-    \\input{format/references}
-\\end{document}
+        "main.tex": r"""\documentclass{beamer}
+\input{format/preamble}
+\input{format/title}
+
+\begin{document}
+    \frame{\titlepage}
+    \input{text/body}
+    \input{format/references}
+\end{document}
 """,
-        "format/packages.tex": """\\usepackage[cmex10]{amsmath}
-\\usepackage{amsthm,amssymb}
-\\usepackage[pdftex]{graphicx}
-\\DeclareGraphicsExtensions{.pdf,.png,.jpg}
-\\usepackage{booktabs}
-\\usepackage{url}
-\\urlstyle{same}
-\\usepackage{amsmath}
+        "format/packages.tex": r"""\usepackage[cmex10]{amsmath}
+\usepackage{amsthm,amssymb}
+\usepackage[pdftex]{graphicx}
+\DeclareGraphicsExtensions{.pdf,.png,.jpg}
+\usepackage{booktabs}
+\usepackage{url}
+\urlstyle{same}
+\usepackage{amsmath}
 """,
-        "format/preamble.tex": """% Load packages
-\\input{format/packages}
+        "format/preamble.tex": r"""% Load packages
+\input{format/packages}
 
 % Beamer theme settings
-\\usetheme{Madrid}
-\\usecolortheme{default}
+\usetheme{Madrid}
+\usecolortheme{default}
 
 % Custom commands and environments
 """,
-        "format/references.tex": """\\bibliographystyle{unsrt}
-\\bibliography{refs}
+        "format/references.tex": r"""\bibliographystyle{unsrt}
+\bibliography{refs}
 """,
-        "format/title.tex": """\\title{Presentation Title}
-\\author{Author Name}
-\\institute{Institution}
-\\date{\\today}
+        "format/title.tex": r"""\title{Presentation Title}
+\author{Author Name}
+\institute{Institution}
+\date{\today}
 """,
-        "text/body.tex": """\\section{Introduction}
+        "text/body.tex": r"""\section{Introduction}
 
-\\begin{frame}
-\\frametitle{First Slide}
+\begin{frame}
+\frametitle{First Slide}
 Your content here.
-\\end{frame}
+\end{frame}
 """,
-        "refs.bib": """% Add your references here
+        "refs.bib": r"""% Add your references here
 """,
-        ".gitignore": """# LaTeX
+        ".gitignore": r"""# LaTeX
 *.aux
 *.bbl
 *.blg
@@ -160,6 +162,16 @@ output/
     }
 }
 
+# Templates encoded once at import time and frozen against mutation, with
+# interned keys so lookups compare by identity
+_TEMPLATES_BYTES: Mapping[str, Mapping[str, bytes]] = MappingProxyType({
+    sys.intern(doc_type): MappingProxyType({
+        sys.intern(file_path): content.encode("utf-8")
+        for file_path, content in files.items()
+    })
+    for doc_type, files in TEMPLATES.items()
+})
+
 # TeX Live installation profile template
 TEXLIVE_PROFILE = """selected_scheme scheme-basic
 TEXDIR {install_dir}
@@ -187,7 +199,7 @@ tlpdbopt_sys_info /usr/local/share/info
 tlpdbopt_sys_man /usr/local/share/man
 """
 
-def get_template_files(doc_type: str) -> Dict[str, str]:
+def get_template_files(doc_type: str) -> Mapping[str, bytes]:
     """
     Get template files for a document type.
 
@@ -198,15 +210,15 @@ def get_template_files(doc_type: str) -> Dict[str, str]:
 
     Returns
     -------
-    Dict[str, str]
-        Dictionary mapping file paths to their content
+    Mapping[str, bytes]
+        Read-only mapping of file paths to their UTF-8 encoded content
 
     Raises
     ------
     ValueError
         If doc_type is not recognized
     """
-    if doc_type not in TEMPLATES:
+    if doc_type not in _TEMPLATES_BYTES:
         raise ValueError(f"Unknown document type: {doc_type}")
 
-    return TEMPLATES[doc_type]
+    return _TEMPLATES_BYTES[doc_type]
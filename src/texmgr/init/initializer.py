@@ -1,13 +1,19 @@
 """Project initialization functionality."""
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from ..utils.errors import InitError, FileOperationError
 from ..utils.logs import logger
 from ..utils.cmds import run_command
-from ..utils.fileops import ensure_dir, safe_write, create_project_structure
+from ..utils.fileops import (
+    create_project_structure,
+    ensure_dirs,
+    is_empty_dir,
+    safe_write_bytes
+)
 from ..config import PROJECT_DIRS, get_template_files
 
 def init_git(project_dir: Path) -> None:
@@ -57,15 +63,19 @@ def create_project_files(project_dir: Path, doc_type: str) -> None:
     except ValueError as e:
         raise InitError(str(e))
 
-    logger.info(f"Creating {doc_type} project files...")
+    logger.info("Creating %s project files...", doc_type)
+
+    # Create all parent directories in one pass before writing
+    try:
+        ensure_dirs((project_dir / file_path).parent for file_path in templates)
+    except FileOperationError as e:
+        raise InitError(f"Failed to create project directories: {str(e)}")
 
     for file_path, content in templates.items():
         try:
             full_path = project_dir / file_path
-            # Create parent directories if needed
-            ensure_dir(full_path.parent)
-            safe_write(full_path, content)
-            logger.debug(f"Created {file_path}")
+            safe_write_bytes(full_path, content)
+            logger.debug("Created %s", file_path)
         except FileOperationError as e:
             raise InitError(f"Failed to create {file_path}: {str(e)}")
 
@@ -88,27 +98,30 @@ def init_project(use_git: bool = True, doc_type: str = "article") -> int:
     try:
         project_dir = Path.cwd()
 
-        # Check if directory is empty
-        if any(project_dir.iterdir()):
+        # Check if directory is empty, stopping at the first entry
+        if not is_empty_dir(project_dir):
             raise InitError(
                 "Directory is not empty. Please use an empty directory for initialization."
             )
 
-        logger.info(f"Initializing new {doc_type} project...")
+        logger.info("Initializing new %s project...", doc_type)
 
         # Create project structure
         create_project_structure(project_dir, PROJECT_DIRS)
 
-        # Create project files
-        create_project_files(project_dir, doc_type)
+        # Initialize git if requested, overlapping with writing the files
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            git_future = executor.submit(init_git, project_dir) if use_git else None
+
+            # Create project files
+            create_project_files(project_dir, doc_type)
 
-        # Initialize git if requested
-        if use_git:
-            init_git(project_dir)
+            if git_future:
+                git_future.result()
 
         logger.info("Project initialization complete!")
         return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
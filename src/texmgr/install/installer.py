@@ -1,14 +1,24 @@
 """TeX Live installation management."""
 
+import hashlib
+import http.client
+import shutil
+import tarfile
 import tempfile
+import time
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional, Tuple
 
 from ..utils.errors import InstallError, DependencyError
 from ..utils.logs import logger
+from ..utils.fileops import ensure_dir
 from ..utils.cmds import (
     check_command_exists,
     run_command,
+    get_installed_packages,
     get_platform,
     check_write_permission
 )
@@ -16,33 +26,201 @@ from ..utils.cmds import (
 TEXLIVE_MIRROR = "https://mirror.ctan.org/systems/texlive/tlnet"
 INSTALL_SCRIPT = "install-tl-unx.tar.gz"
 
-def download_texlive_installer() -> Path:
+# Commands that install Pandoc with each Linux package manager, tried in order
+LINUX_PANDOC_COMMANDS = {
+    "apt-get": [
+        ["apt-get", "update"],
+        ["apt-get", "install", "-y", "pandoc"],
+    ],
+    "dnf": [["dnf", "install", "-y", "pandoc"]],
+    "pacman": [["pacman", "-S", "--noconfirm", "pandoc"]],
+}
+
+# Downloaded installers are kept here so a retried install can reuse them
+INSTALLER_CACHE_DIR = Path.home() / ".texmgr" / "cache"
+
+# Download read size, number of attempts, first retry delay and socket
+# timeout (seconds) after which a stalled connection is retried
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_BACKOFF = 1.0
+DOWNLOAD_TIMEOUT = 30
+
+def download_file(url: str, dest: Path) -> Path:
     """
-    Download the TeX Live installer script.
+    Download a file in chunks, resuming interrupted transfers.
+
+    Parameters
+    ----------
+    url : str
+        URL to download
+    dest : Path
+        Path to write the file to
 
     Returns
     -------
     Path
-        Path to the downloaded installer
+        Path to the downloaded file
 
     Raises
     ------
     InstallError
-        If download fails
+        If the download still fails after all retries
+
+    Notes
+    -----
+    Data is written to ``<dest>.part`` and renamed once complete. Failed
+    attempts are retried with exponential backoff, and each retry asks the
+    server for the missing bytes only (HTTP Range). Retries go to the URL
+    the first response was redirected to, so a resumed download keeps
+    using the same CTAN mirror.
     """
-    logger.info("Downloading TeX Live installer...")
-    temp_dir = Path(tempfile.mkdtemp())
-    installer_path = temp_dir / INSTALL_SCRIPT
+    part_path = dest.with_name(dest.name + ".part")
+    delay = DOWNLOAD_BACKOFF
+    last_error: Exception = InstallError("no download attempted")
+
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        existing = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={existing}-"} if existing else {}
+
+        try:
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                url = response.geturl()
+                # Servers that ignore Range send the whole file again
+                resumed = bool(existing) and response.status == 206
+                expected = response.headers.get("Content-Length")
+                received = 0
+                with open(part_path, "ab" if resumed else "wb") as out:
+                    while chunk := response.read(DOWNLOAD_CHUNK_SIZE):
+                        out.write(chunk)
+                        received += len(chunk)
+
+            # A dropped connection can end the stream early without an error
+            if expected is not None and received < int(expected):
+                raise OSError(f"connection closed after {received} of {expected} bytes")
+
+            part_path.replace(dest)
+            logger.debug("Downloaded %s to %s", url, dest)
+            return dest
+
+        except urllib.error.HTTPError as e:
+            if e.code == 416:
+                # The partial file does not match the server copy; start over
+                part_path.unlink(missing_ok=True)
+            elif e.code < 500:
+                raise InstallError(f"Failed to download {url}: {str(e)}")
+            last_error = e
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            last_error = e
+
+        if attempt < DOWNLOAD_RETRIES:
+            logger.warning("Download failed (%s), retrying in %gs...", last_error, delay)
+            time.sleep(delay)
+            delay *= 2
+
+    raise InstallError(f"Failed to download {url}: {str(last_error)}")
+
+def fetch_installer_checksum() -> Tuple[str, Optional[str]]:
+    """
+    Fetch the SHA-512 checksum the mirror publishes for the installer.
 
+    Returns
+    -------
+    Tuple[str, Optional[str]]
+        URL of the installer on the mirror that served the checksum, and
+        the hex digest of the installer, None if it cannot be fetched
+
+    Notes
+    -----
+    mirror.ctan.org redirects every request to a nearby mirror, and two
+    requests may reach mirrors holding different releases. The installer
+    must therefore be downloaded from the returned URL, which is on the
+    same mirror as the checksum.
+    """
+    installer_url = f"{TEXLIVE_MIRROR}/{INSTALL_SCRIPT}"
+    url = f"{installer_url}.sha512"
     try:
-        url = f"{TEXLIVE_MIRROR}/{INSTALL_SCRIPT}"
-        urllib.request.urlretrieve(url, installer_path)
-        logger.debug(f"Downloaded installer to {installer_path}")
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+            mirror_url = response.geturl()
+            # Format is "<digest>  install-tl-unx.tar.gz"
+            digest = response.read().decode("ascii").split()[0].lower()
+    except (
+        urllib.error.URLError, http.client.HTTPException, OSError,
+        UnicodeDecodeError, IndexError
+    ) as e:
+        logger.debug("Could not fetch installer checksum: %s", e)
+        return installer_url, None
+
+    if not mirror_url.endswith(".sha512"):
+        logger.debug("Checksum was redirected to unexpected URL %s", mirror_url)
+        return installer_url, None
+
+    return mirror_url.removesuffix(".sha512"), digest
+
+def file_sha512(path: Path) -> str:
+    """
+    Compute the SHA-512 digest of a file.
+
+    Parameters
+    ----------
+    path : Path
+        File to hash
+
+    Returns
+    -------
+    str
+        Hex digest of the file contents
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha512").hexdigest()
+
+def download_texlive_installer(cache_dir: Path = INSTALLER_CACHE_DIR) -> Path:
+    """
+    Download the TeX Live installer archive, reusing a cached copy.
+
+    Parameters
+    ----------
+    cache_dir : Path, optional
+        Directory the installer is kept in, by default ~/.texmgr/cache
+
+    Returns
+    -------
+    Path
+        Path to the downloaded installer
+
+    Raises
+    ------
+    InstallError
+        If download fails or the installer does not match its checksum
+
+    Notes
+    -----
+    A cached installer is only reused if it matches the checksum on the
+    mirror, so a new TeX Live release is downloaded again. If the checksum
+    cannot be fetched the cache cannot be trusted to be current, so the
+    installer is downloaded again and used unverified. The installer is
+    fetched from the mirror that served the checksum.
+    """
+    installer_path = ensure_dir(cache_dir) / INSTALL_SCRIPT
+    installer_url, expected = fetch_installer_checksum()
+
+    if expected is None:
+        logger.warning("Could not fetch the TeX Live installer checksum, skipping verification")
+    elif installer_path.exists() and file_sha512(installer_path) == expected:
+        logger.info("Using cached TeX Live installer")
         return installer_path
-    except Exception as e:
-        raise InstallError(f"Failed to download TeX Live installer: {str(e)}")
 
-def extract_installer(installer_path: Path) -> Path:
+    logger.info("Downloading TeX Live installer...")
+    download_file(installer_url, installer_path)
+
+    if expected is not None and file_sha512(installer_path) != expected:
+        installer_path.unlink(missing_ok=True)
+        raise InstallError("Downloaded installer does not match the mirror checksum")
+
+    return installer_path
+
+def extract_installer(installer_path: Path, dest_dir: Path) -> Path:
     """
     Extract the TeX Live installer.
 
@@ -50,6 +228,8 @@ def extract_installer(installer_path: Path) -> Path:
     ----------
     installer_path : Path
         Path to the downloaded installer
+    dest_dir : Path
+        Directory to extract the installer into
 
     Returns
     -------
@@ -62,23 +242,20 @@ def extract_installer(installer_path: Path) -> Path:
         If extraction fails
     """
     logger.info("Extracting TeX Live installer...")
-    try:
-        extract_dir = installer_path.parent
-        run_command(
-            ["tar", "xzf", installer_path],
-            cwd=extract_dir,
-            error_msg="Failed to extract installer"
-        )
 
-        # Find the extracted directory (should be install-tl-YYYYMMDD)
-        install_dirs = [d for d in extract_dir.iterdir() if d.is_dir() and d.name.startswith("install-tl-")]
-        if not install_dirs:
-            raise InstallError("Could not find extracted installer directory")
-
-        return install_dirs[0]
+    try:
+        with tarfile.open(installer_path, mode="r:gz") as archive:
+            archive.extractall(dest_dir, filter="data")
     except Exception as e:
         raise InstallError(f"Failed to extract installer: {str(e)}")
 
+    # Find the extracted directory (should be install-tl-YYYYMMDD)
+    install_dirs = [d for d in dest_dir.iterdir() if d.is_dir() and d.name.startswith("install-tl-")]
+    if not install_dirs:
+        raise InstallError("Could not find extracted installer directory")
+
+    return install_dirs[0]
+
 def create_profile(install_dir: Path) -> Path:
     """
     Create a TeX Live installation profile.
@@ -138,10 +315,16 @@ def run_installer(installer_dir: Path, profile_path: Path) -> None:
     except Exception as e:
         raise InstallError(f"TeX Live installation failed: {str(e)}")
 
-def install_pandoc() -> None:
+def install_pandoc(capture_output: bool = False) -> None:
     """
     Install Pandoc using the system package manager.
 
+    Parameters
+    ----------
+    capture_output : bool, optional
+        Capture the package manager output instead of passing it through
+        to the terminal, by default False
+
     Raises
     ------
     InstallError
@@ -154,24 +337,27 @@ def install_pandoc() -> None:
         if system == "darwin":  # macOS
             run_command(
                 ["brew", "install", "pandoc"],
-                error_msg="Failed to install Pandoc"
+                error_msg="Failed to install Pandoc",
+                capture_output=capture_output
             )
         elif system == "linux":
-            # Try apt first, then other package managers
-            package_managers = [
-                ["apt-get", "update", "&&", "apt-get", "install", "-y", "pandoc"],
-                ["dnf", "install", "-y", "pandoc"],
-                ["pacman", "-S", "--noconfirm", "pandoc"],
-            ]
-
-            for cmd in package_managers:
+            last_error = None
+            for manager, commands in LINUX_PANDOC_COMMANDS.items():
+                if not check_command_exists(manager):
+                    continue
                 try:
-                    run_command(cmd, error_msg="Failed to install Pandoc")
+                    for cmd in commands:
+                        run_command(
+                            cmd,
+                            error_msg="Failed to install Pandoc",
+                            capture_output=capture_output
+                        )
                     break
-                except InstallError:
+                except InstallError as e:
+                    last_error = e
                     continue
             else:
-                raise InstallError("No supported package manager found")
+                raise last_error or InstallError("No supported package manager found")
         else:
             raise InstallError(f"Unsupported operating system: {system}")
 
@@ -243,14 +429,23 @@ def install_core_packages() -> None:
         "texliveonfly"  # Automatically install missing packages
     ]
 
+    installed = get_installed_packages()
+    missing = [pkg for pkg in core_packages if pkg not in installed]
+    if not missing:
+        logger.info("Core LaTeX packages are already installed")
+        return
+
     logger.info("Installing core LaTeX packages...")
     try:
         run_command(
-            ["tlmgr", "install"] + core_packages,
-            error_msg="Failed to install core packages"
+            ["tlmgr", "install"] + missing,
+            error_msg="Failed to install core packages",
+            capture_output=False
         )
     except Exception as e:
         raise InstallError(f"Failed to install core packages: {str(e)}")
+    finally:
+        get_installed_packages.cache_clear()
 
 def install_texlive() -> int:
     """
@@ -273,27 +468,41 @@ def install_texlive() -> int:
                 "Please run with sudo or choose a different installation directory."
             )
 
-        installer_path = download_texlive_installer()
-        installer_dir = extract_installer(installer_path)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Pandoc comes from the system package manager and does not need
+            # TeX Live, so it installs while TeX Live downloads and installs
+            pandoc_future = None
+            if not check_command_exists("pandoc"):
+                pandoc_future = executor.submit(install_pandoc, capture_output=True)
 
-        profile_path = create_profile(install_dir)
-        run_installer(installer_dir, profile_path)
+            installer_path = download_texlive_installer()
+            work_dir = Path(tempfile.mkdtemp())
+            installer_dir = extract_installer(installer_path, work_dir)
+
+            profile_path = create_profile(install_dir)
+            run_installer(installer_dir, profile_path)
+            install_core_packages()
+
+            if pandoc_future is not None:
+                try:
+                    pandoc_future.result()
+                except InstallError as e:
+                    logger.error("%s", e)
 
-        if not check_command_exists("pandoc"):
-            install_pandoc()
-        install_core_packages()
+        # Forget the lookups made before the new binaries existed
+        check_command_exists.cache_clear()
         verify_installation()
 
         logger.info("Installation completed successfully!")
         return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
 
     finally:
-        if 'installer_path' in locals():
-            installer_path.parent.unlink(missing_ok=True)
+        if 'work_dir' in locals():
+            shutil.rmtree(work_dir, ignore_errors=True)
 
 def update_texlive() -> int:
     """
@@ -308,12 +517,13 @@ def update_texlive() -> int:
         logger.info("Updating TeX Live...")
         run_command(
             ["tlmgr", "update", "--self", "--all"],
-            error_msg="Failed to update TeX Live"
+            error_msg="Failed to update TeX Live",
+            capture_output=False
         )
 
         logger.info("TeX Live updated successfully!")
         return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
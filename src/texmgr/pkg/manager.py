@@ -1,16 +1,34 @@
 """Package management functionality."""
 
+import hashlib
+import logging
+import os
 import re
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, List, Optional, Dict, Set, Tuple
 
-from ..utils.errors import PackageError, PackageNotFoundError, FileOperationError
+from ..utils.errors import (
+    InstallError,
+    PackageError,
+    PackageNotFoundError,
+    FileOperationError
+)
 from ..utils.logs import logger
-from ..utils.cmds import run_command, check_command_exists
-from ..utils.fileops import find_file
+from ..utils.cmds import run_command, check_command_exists, get_installed_packages
+from ..utils.fileops import find_file, ensure_dir
+
+# Marker files for packages.tex contents that were installed successfully
+PACKAGE_CACHE_DIR = Path.home() / ".texmgr" / "cache"
+
+# Matches \usepackage[options]{package} or \usepackage{package} at the
+# start of a line, so commented-out packages are ignored
+_USEPACKAGE_RE = re.compile(
+    r'^[ \t]*\\usepackage(?:\[([^\]]*)\])?\{([^}]+)\}',
+    re.MULTILINE
+)
 
 def parse_package_line(line: str) -> List[Tuple[str, Optional[str]]]:
-    """
+    r"""
     Parse a single \usepackage line to extract package names and options.
 
     Parameters
@@ -23,9 +41,11 @@ def parse_package_line(line: str) -> List[Tuple[str, Optional[str]]]:
     List[Tuple[str, Optional[str]]]
         List of tuples containing (package_name, options)
     """
-    # Match \usepackage[options]{package} or \usepackage{package}
-    pattern = r'\\usepackage(?:\[([^\]]*)\])?\{([^}]+)\}'
-    match = re.match(pattern, line.strip())
+    line = line.strip()
+    if not line.startswith('\\usepackage'):
+        return []
+
+    match = _USEPACKAGE_RE.match(line)
 
     if not match:
         return []
@@ -51,37 +71,49 @@ def parse_packages(content: str) -> List[Tuple[str, Optional[str]]]:
         List of tuples containing (package_name, options)
     """
     packages = []
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-    # Process line by line for better error handling and logging
-    for line in content.splitlines():
-        line = line.strip()
-        if line.startswith('\\usepackage'):
-            try:
-                line_packages = parse_package_line(line)
-                packages.extend(line_packages)
-
-                # Log packages with options for debugging
-                for pkg, opts in line_packages:
-                    if opts:
-                        logger.debug(f"Found package {pkg} with options: [{opts}]")
-                    else:
-                        logger.debug(f"Found package {pkg}")
-
-            except Exception as e:
-                logger.warning(f"Failed to parse package line: {line}")
-                logger.debug(f"Parse error: {str(e)}")
+    # One pass over the whole file instead of splitting it into lines
+    for match in _USEPACKAGE_RE.finditer(content):
+        options = match.group(1)  # Could be None if no options
+        for pkg in match.group(2).split(','):
+            pkg = pkg.strip()
+            if not pkg:
                 continue
+            packages.append((pkg, options))
+
+            # Log packages with options for debugging
+            if debug:
+                if options:
+                    logger.debug("Found package %s with options: [%s]", pkg, options)
+                else:
+                    logger.debug("Found package %s", pkg)
 
     return packages
 
-def read_packages_file() -> List[Tuple[str, Optional[str]]]:
+def get_tlmgr_version() -> str:
+    """
+    Get the version banner of the installed tlmgr.
+
+    Returns
+    -------
+    str
+        Output of ``tlmgr --version``, empty if it cannot be run
+    """
+    try:
+        return run_command(["tlmgr", "--version"]).stdout
+    except InstallError:
+        return ""
+
+def read_packages_file() -> Tuple[List[Tuple[str, Optional[str]]], str]:
     """
     Read and parse packages from packages.tex file.
 
     Returns
     -------
-    List[Tuple[str, Optional[str]]]
-        List of tuples containing (package_name, options)
+    Tuple[List[Tuple[str, Optional[str]]], str]
+        List of tuples containing (package_name, options), and a SHA-256
+        digest of the file contents and the tlmgr version
 
     Raises
     ------
@@ -94,11 +126,58 @@ def read_packages_file() -> List[Tuple[str, Optional[str]]]:
         raise FileOperationError("Could not find packages.tex in project")
 
     try:
-        content = packages_file.read_text()
-        return parse_packages(content)
+        content = packages_file.read_bytes()
+        packages = parse_packages(content.decode("utf-8"))
     except Exception as e:
         raise FileOperationError(f"Failed to read packages.tex: {str(e)}")
 
+    # A new TeX Live release can need the same packages installed again
+    digest = hashlib.sha256(content)
+    digest.update(get_tlmgr_version().encode("utf-8"))
+
+    return packages, digest.hexdigest()
+
+def find_available_packages(packages: Iterable[str]) -> Set[str]:
+    """
+    Find packages whose style file TeX can already resolve.
+
+    Parameters
+    ----------
+    packages : Iterable[str]
+        Names of the packages to look up
+
+    Returns
+    -------
+    Set[str]
+        Names of the packages with a ``<name>.sty`` on the TeX search path
+
+    Notes
+    -----
+    All names are looked up with a single kpsewhich call, which takes
+    milliseconds where a tlmgr start takes seconds.
+    """
+    names = list(packages)
+    if not names or not check_command_exists("kpsewhich"):
+        return set()
+
+    try:
+        # kpsewhich exits non-zero when any file is missing
+        result = run_command(
+            ["kpsewhich", *(f"{name}.sty" for name in names)],
+            error_msg="Failed to look up packages",
+            check=False
+        )
+    except InstallError as e:
+        logger.debug("%s", e)
+        return set()
+
+    found = {
+        os.path.basename(line.strip())[:-len(".sty")]
+        for line in result.stdout.splitlines()
+        if line.strip().endswith(".sty")
+    }
+    return {name for name in names if name in found}
+
 def install_package(package: str, options: Optional[str] = None) -> None:
     """
     Install a LaTeX package using tlmgr.
@@ -119,18 +198,110 @@ def install_package(package: str, options: Optional[str] = None) -> None:
         raise PackageError("tlmgr not found. Please install TeX Live first")
 
     try:
-        msg = f"Installing package: {package}"
         if options:
-            msg += f" (used with options: [{options}])"
-        logger.info(msg)
+            logger.info("Installing package: %s (used with options: [%s])", package, options)
+        else:
+            logger.info("Installing package: %s", package)
 
         run_command(
             ["tlmgr", "install", package],
-            error_msg=f"Failed to install package {package}"
+            error_msg=f"Failed to install package {package}",
+            capture_output=False
         )
     except Exception as e:
         raise PackageError(f"Failed to install package {package}: {str(e)}")
 
+def install_packages(packages: List[Tuple[str, Optional[str]]]) -> List[str]:
+    """
+    Install LaTeX packages with a single tlmgr invocation.
+
+    Parameters
+    ----------
+    packages : List[Tuple[str, Optional[str]]]
+        List of tuples containing (package_name, options)
+
+    Returns
+    -------
+    List[str]
+        Names of the packages that could not be installed
+
+    Raises
+    ------
+    PackageError
+        If tlmgr is not available
+
+    Notes
+    -----
+    Every tlmgr start loads the whole TeX Live package database, so
+    packages whose style file kpsewhich already finds, or that tlmgr lists
+    as installed, are skipped and the rest are installed in one call. If
+    that call fails, the packages it did not install are installed one by
+    one so that a single bad name does not block the others.
+    """
+    if not check_command_exists("tlmgr"):
+        raise PackageError("tlmgr not found. Please install TeX Live first")
+
+    # Deduplicate while keeping the first options seen for each package
+    unique: Dict[str, Optional[str]] = {}
+    for package, options in packages:
+        unique.setdefault(package, options)
+        if options:
+            logger.debug("Package %s is used with options: [%s]", package, options)
+
+    # kpsewhich is far cheaper than tlmgr, so only list the tlmgr database
+    # when some packages are still unaccounted for
+    skipped = find_available_packages(unique)
+    if len(skipped) < len(unique):
+        installed = get_installed_packages()
+        skipped.update(package for package in unique if package in installed)
+
+    for package in skipped:
+        logger.debug("%s is already installed", package)
+        del unique[package]
+    if skipped:
+        logger.info("Skipping %d already installed packages", len(skipped))
+
+    if not unique:
+        return []
+
+    try:
+        logger.info("Installing %d packages: %s", len(unique), ', '.join(unique))
+        run_command(
+            ["tlmgr", "install", *unique],
+            error_msg="Failed to install packages",
+            capture_output=False
+        )
+        return []
+    except InstallError as e:
+        logger.warning("Batch installation failed, installing packages one by one")
+        logger.debug("%s", e)
+    finally:
+        get_installed_packages.cache_clear()
+
+    # A failed batch may still have installed some of the packages, so
+    # refresh the list and retry only the rest
+    installed = get_installed_packages()
+    remaining = {
+        package: options
+        for package, options in unique.items()
+        if package not in installed
+    }
+    if len(remaining) < len(unique):
+        logger.info(
+            "%d packages were installed before the batch failed",
+            len(unique) - len(remaining)
+        )
+
+    failed = []
+    for package, options in remaining.items():
+        try:
+            install_package(package, options)
+        except PackageError as e:
+            logger.warning("Failed to install %s: %s", package, e)
+            failed.append(package)
+
+    return failed
+
 def handle_package_command(command: str, args) -> int:
     """
     Handle package-related commands.
@@ -150,20 +321,27 @@ def handle_package_command(command: str, args) -> int:
     try:
         if command == "install":
             # Get packages from packages.tex
-            packages = read_packages_file()
-            logger.info(f"Found {len(packages)} packages to install")
+            packages, digest = read_packages_file()
+            marker = PACKAGE_CACHE_DIR / f"{digest}.ok"
+            if marker.exists():
+                logger.info("packages.tex unchanged since the last install, nothing to do")
+                return 0
+
+            logger.info("Found %d packages to install", len(packages))
 
-            # Install each package
-            for package, options in packages:
+            failed = install_packages(packages)
+            if failed:
+                logger.warning("Could not install: %s", ', '.join(failed))
+            else:
                 try:
-                    install_package(package, options)
-                except PackageError as e:
-                    logger.warning(f"Failed to install {package}: {str(e)}")
-                    continue
+                    ensure_dir(PACKAGE_CACHE_DIR)
+                    marker.touch()
+                except (FileOperationError, OSError) as e:
+                    logger.debug("Could not record package cache: %s", e)
 
             logger.info("Package installation complete")
             return 0
 
     except Exception as e:
-        logger.error(str(e))
+        logger.error("%s", e)
         return 1
@@ -1,17 +1,30 @@
 """Utility functions for TeX Live installation."""
 
+import asyncio
+import functools
+import logging
 import os
+import platform
 import shutil
 import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from .errors import InstallError
 
+logger = logging.getLogger("texmgr")
+
+# Read size for streaming asyncio subprocess output
+STREAM_CHUNK_SIZE = 1 << 16
+
+@functools.lru_cache(maxsize=64)
 def check_command_exists(command: str) -> bool:
     """
     Check if a command exists in the system PATH.
 
+    Results are cached for the lifetime of the process; call
+    ``check_command_exists.cache_clear()`` after installing new binaries.
+
     Parameters
     ----------
     command : str
@@ -27,7 +40,9 @@ def check_command_exists(command: str) -> bool:
 def run_command(
     cmd: List[str],
     cwd: Optional[Path] = None,
-    error_msg: str = "Command failed"
+    error_msg: str = "Command failed",
+    capture_output: bool = True,
+    check: bool = True
 ) -> subprocess.CompletedProcess:
     """
     Run a shell command safely.
@@ -40,31 +55,152 @@ def run_command(
         Working directory for the command
     error_msg : str
         Error message prefix if command fails
+    capture_output : bool, optional
+        Capture output instead of passing it through to the terminal,
+        by default True
+    check : bool, optional
+        Raise if the command exits with a non-zero status, by default True
 
     Returns
     -------
     subprocess.CompletedProcess
-        Completed process information
+        Completed process information, with stderr merged into stdout
+        when output is captured
 
     Raises
     ------
     InstallError
-        If command execution fails
+        If the command cannot be run, or exits with a non-zero status
+        while check is True
+
+    Notes
+    -----
+    Captured output is streamed line by line into the debug log while the
+    command runs rather than buffered until it exits.
     """
     try:
-        result = subprocess.run(
+        if not capture_output:
+            return subprocess.run(cmd, cwd=cwd, check=check)
+
+        lines = []
+        with subprocess.Popen(
             cmd,
             cwd=cwd,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return result
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as process:
+            for line in process.stdout:
+                logger.debug(line.rstrip())
+                lines.append(line)
+
+        output = "".join(lines)
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, output)
+        return subprocess.CompletedProcess(cmd, process.returncode, output)
     except subprocess.CalledProcessError as e:
-        raise InstallError(f"{error_msg}: {e.stderr}")
+        raise InstallError(f"{error_msg}: {e.output or f'exit status {e.returncode}'}")
+    except Exception as e:
+        raise InstallError(f"{error_msg}: {str(e)}")
+
+async def _read_stream(stream: asyncio.StreamReader) -> str:
+    """
+    Read a subprocess stream, logging each line.
+
+    Parameters
+    ----------
+    stream : asyncio.StreamReader
+        Stdout or stderr of a subprocess
+
+    Returns
+    -------
+    str
+        Everything read from the stream
+
+    Notes
+    -----
+    The stream is read in fixed-size chunks rather than with readline, so
+    lines longer than the StreamReader limit (64 KiB) do not raise.
+    """
+    chunks = []
+    partial = b""
+    while chunk := await stream.read(STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        *lines, partial = (partial + chunk).split(b"\n")
+        for line in lines:
+            logger.debug(line.decode(errors="replace").rstrip())
+    if partial:
+        logger.debug(partial.decode(errors="replace").rstrip())
+    return b"".join(chunks).decode(errors="replace")
+
+async def run_command_async(
+    cmd: List[str],
+    cwd: Optional[Path] = None,
+    error_msg: str = "Command failed",
+    capture_output: bool = True
+) -> subprocess.CompletedProcess:
+    """
+    Run a command as an asyncio subprocess.
+
+    Parameters
+    ----------
+    cmd : List[str]
+        Command and arguments to run
+    cwd : Optional[Path]
+        Working directory for the command
+    error_msg : str
+        Error message prefix if command fails
+    capture_output : bool, optional
+        Capture stdout/stderr instead of passing them through to the
+        terminal, by default True
+
+    Returns
+    -------
+    subprocess.CompletedProcess
+        Completed process information
+
+    Raises
+    ------
+    InstallError
+        If command execution fails
+
+    Notes
+    -----
+    Captured output is streamed into the debug log as it arrives. If the
+    awaiting task is cancelled or reading the output fails, the subprocess
+    is killed and reaped.
+    """
+    stdio = asyncio.subprocess.PIPE if capture_output else None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd, stdout=stdio, stderr=stdio
+        )
     except Exception as e:
         raise InstallError(f"{error_msg}: {str(e)}")
 
+    try:
+        stdout = stderr = None
+        if capture_output:
+            stdout, stderr = await asyncio.gather(
+                _read_stream(process.stdout), _read_stream(process.stderr)
+            )
+        returncode = await process.wait()
+    except BaseException as e:
+        # Never leave the child running with nobody reading its pipes
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        if isinstance(e, Exception):
+            raise InstallError(f"{error_msg}: {str(e)}") from e
+        raise
+
+    if returncode != 0:
+        detail = stderr if capture_output else f"exit status {returncode}"
+        raise InstallError(f"{error_msg}: {detail}")
+
+    return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
 def get_texlive_path() -> Optional[Path]:
     """
     Get the path to TeX Live installation.
@@ -82,6 +218,45 @@ def get_texlive_path() -> Optional[Path]:
             pass
     return None
 
+@functools.lru_cache(maxsize=1)
+def get_installed_packages() -> FrozenSet[str]:
+    """
+    Get the names of the TeX Live packages that are already installed.
+
+    Returns
+    -------
+    FrozenSet[str]
+        Installed package names, empty if tlmgr is unavailable or fails
+
+    Notes
+    -----
+    The result is cached for the lifetime of the process, so tlmgr loads
+    its package database only once. Call
+    ``get_installed_packages.cache_clear()`` after installing packages.
+    """
+    if not check_command_exists("tlmgr"):
+        return frozenset()
+    try:
+        result = run_command(
+            ["tlmgr", "info", "--only-installed", "--data", "name"],
+            error_msg="Failed to list installed packages"
+        )
+    except InstallError as e:
+        logger.debug("%s", e)
+        return frozenset()
+    return frozenset(line.strip() for line in result.stdout.splitlines() if line.strip())
+
+def get_platform() -> str:
+    """
+    Get the name of the current operating system.
+
+    Returns
+    -------
+    str
+        Lower-case system name, e.g. 'linux' or 'darwin'
+    """
+    return platform.system().lower()
+
 def check_write_permission(path: Path) -> bool:
     """
     Check if we have write permission for a path.
@@ -95,12 +270,19 @@ def check_write_permission(path: Path) -> bool:
     -------
     bool
         True if we have write permission, False otherwise
+
+    Notes
+    -----
+    A path that does not exist yet is writable if its nearest existing
+    ancestor is, since that is where the missing directories would be
+    created. Nothing is created on disk by the check.
     """
     if path.exists():
         return os.access(path, os.W_OK)
-    try:
-        path.mkdir(parents=True, exist_ok=True)
-        path.rmdir()
-        return True
-    except (OSError, PermissionError):
-        return False
+
+    ancestor = path.absolute().parent
+    while not ancestor.exists():
+        ancestor = ancestor.parent
+
+    # Creating entries needs both write and search permission
+    return os.access(ancestor, os.W_OK | os.X_OK)
@@ -1,8 +1,12 @@
 """Utility functions for file operations."""
 
+import functools
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, List, Optional
+from typing import Iterable, Set, Union, List, Optional
 import logging
 
 from .errors import FileOperationError
@@ -41,6 +45,51 @@ def ensure_dir(path: Union[str, Path]) -> Path:
     return path
 
 
+def ensure_dirs(paths: Iterable[Union[str, Path]]) -> None:
+    """
+    Ensure several directories exist, creating each one at most once.
+
+    Parameters
+    ----------
+    paths : Iterable[Union[str, Path]]
+        Paths to the directories
+
+    Raises
+    ------
+    FileOperationError
+        If directory creation fails or a path exists but is not a directory
+
+    Notes
+    -----
+    Duplicates are dropped, as are paths that are ancestors of another
+    requested path since ``mkdir(parents=True)`` creates them anyway.
+    """
+    unique = {Path(path) for path in paths}
+    parents = {parent for path in unique for parent in path.parents}
+
+    for path in unique - parents:
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            raise FileOperationError(f"Failed to create directory {path}: {str(e)}")
+
+
+# Parent directories already created by this process
+_ensured_parents: Set[Path] = set()
+_ensured_parents_lock = threading.Lock()
+
+
+def _ensure_parent(path: Path) -> None:
+    """Create the parent directory of path once per process."""
+    parent = path.parent
+    if parent in _ensured_parents:
+        return
+
+    parent.mkdir(parents=True, exist_ok=True)
+    with _ensured_parents_lock:
+        _ensured_parents.add(parent)
+
+
 def safe_copy(
     src: Union[str, Path], dst: Union[str, Path], overwrite: bool = False
 ) -> Path:
@@ -76,7 +125,7 @@ def safe_copy(
 
     try:
         # Ensure the parent directory exists
-        dst.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_parent(dst)
         shutil.copy2(src, dst)
     except Exception as e:
         raise FileOperationError(f"Failed to copy {src} to {dst}: {str(e)}")
@@ -114,7 +163,7 @@ def safe_write(path: Union[str, Path], content: str, overwrite: bool = False) ->
 
     try:
         # Ensure the parent directory exists
-        path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_parent(path)
         path.write_text(content)
     except Exception as e:
         raise FileOperationError(f"Failed to write to {path}: {str(e)}")
@@ -122,6 +171,57 @@ def safe_write(path: Union[str, Path], content: str, overwrite: bool = False) ->
     return path
 
 
+def safe_write_bytes(
+    path: Union[str, Path], data: bytes, overwrite: bool = False
+) -> Path:
+    """
+    Safely write binary content to a file.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Path to write to
+    data : bytes
+        Content to write
+    overwrite : bool, optional
+        Whether to overwrite existing files, by default False
+
+    Returns
+    -------
+    Path
+        Path to the written file
+
+    Raises
+    ------
+    FileOperationError
+        If write operation fails or file exists and overwrite is False
+
+    Notes
+    -----
+    The existence check and file creation happen in a single ``open`` with
+    ``O_EXCL``, and the parent directory is only created if that open fails
+    because it is missing.
+    """
+    path = Path(path)
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if overwrite else os.O_EXCL)
+
+    try:
+        try:
+            fd = os.open(path, flags, 0o666)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, flags, 0o666)
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    except FileExistsError:
+        raise FileOperationError(f"File already exists: {path}")
+    except Exception as e:
+        raise FileOperationError(f"Failed to write to {path}: {str(e)}")
+
+    return path
+
+
 def create_project_structure(root: Union[str, Path], dirs: List[str]) -> None:
     """
     Create a project directory structure.
@@ -139,9 +239,33 @@ def create_project_structure(root: Union[str, Path], dirs: List[str]) -> None:
         If directory creation fails
     """
     root = Path(root)
+    ensure_dirs(root / dir_path for dir_path in dirs)
+
+
+def is_empty_dir(path: Union[str, Path]) -> bool:
+    """
+    Check whether a directory has no entries.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Directory to check
+
+    Returns
+    -------
+    bool
+        True if the directory is empty, False otherwise
 
-    for dir_path in dirs:
-        ensure_dir(root / dir_path)
+    Raises
+    ------
+    FileOperationError
+        If the directory cannot be read
+    """
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is None
+    except Exception as e:
+        raise FileOperationError(f"Failed to read directory {path}: {str(e)}")
 
 
 def find_file(
@@ -164,26 +288,26 @@ def find_file(
     Optional[Path]
         Path to the file if found, None otherwise
     """
-    start_path = Path(start_path)
+    current = os.path.normpath(start_path)
 
-    if not start_path.is_dir():
-        logger.debug(f"Start path is not a directory: {start_path}")
+    if not os.path.isdir(current):
+        logger.debug("Start path is not a directory: %s", start_path)
         return None
 
     try:
-        current_path = start_path
+        # Walk with plain strings; only a match is turned into a Path
         for _ in range(max_depth + 1):
-            file_path = current_path / filename
-            if file_path.is_file():
-                return file_path
+            file_path = os.path.join(current, filename)
+            if os.path.isfile(file_path):
+                return Path(file_path)
 
-            if current_path == current_path.parent:  # Reached root
+            parent = os.path.dirname(current) or os.curdir
+            if parent == current:  # Reached root
                 break
-
-            current_path = current_path.parent
+            current = parent
 
     except Exception as e:
-        logger.debug(f"Error while searching for {filename}: {str(e)}")
+        logger.debug("Error while searching for %s: %s", filename, e)
 
     return None
 
@@ -206,21 +330,31 @@ def clean_directory(
     FileOperationError
         If cleaning operation fails
     """
-    path = Path(path)
-    exclude = exclude or []
+    exclude_set = set(exclude or ())
 
-    if not path.is_dir():
+    if not os.path.isdir(path):
         raise FileOperationError(f"Not a directory: {path}")
 
     try:
-        for item in path.iterdir():
-            if item.name in exclude:
-                continue
-
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name in exclude_set:
+                    continue
+
+                # Symlinks are removed themselves, never followed
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    os.unlink(entry.path)
+
+        # Subtrees are independent and rmtree releases the GIL in its syscalls
+        if len(subdirs) > 1:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                for future in [executor.submit(shutil.rmtree, d) for d in subdirs]:
+                    future.result()
+        elif subdirs:
+            shutil.rmtree(subdirs[0])
     except Exception as e:
         raise FileOperationError(f"Failed to clean directory {path}: {str(e)}")
 
@@ -243,9 +377,15 @@ def detect_project_root(
 
     Notes
     -----
-    A directory is considered a project root if it contains a main.tex file
+    A directory is considered a project root if it contains a main.tex file.
+    Results are cached per start path for the lifetime of the process.
     """
-    start_path = Path(start_path or Path.cwd())
+    return _detect_project_root(str(start_path or Path.cwd()))
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_project_root(start_path: str) -> Optional[Path]:
+    """Cached worker for detect_project_root."""
     result = find_file(start_path, "main.tex")
     return result.parent if result else None
 
@@ -272,21 +412,29 @@ def is_valid_project_dir(path: Union[str, Path]) -> bool:
     - output/ directory
     - text/ directory
     """
-    path = Path(path)
-
     required_files = ["main.tex"]
     required_dirs = ["format", "output", "text"]
 
+    # One directory read; DirEntry caches the file type from readdir
+    try:
+        with os.scandir(path) as it:
+            entries = {entry.name: entry for entry in it}
+    except OSError as e:
+        logger.debug("Cannot read project directory %s: %s", path, e)
+        return False
+
     # Check if all required files exist
     for file in required_files:
-        if not (path / file).is_file():
-            logger.debug(f"Required file missing: {file}")
+        entry = entries.get(file)
+        if entry is None or not entry.is_file():
+            logger.debug("Required file missing: %s", file)
             return False
 
     # Check if all required directories exist
     for dir_name in required_dirs:
-        if not (path / dir_name).is_dir():
-            logger.debug(f"Required directory missing: {dir_name}")
+        entry = entries.get(dir_name)
+        if entry is None or not entry.is_dir():
+            logger.debug("Required directory missing: %s", dir_name)
             return False
 
     return True
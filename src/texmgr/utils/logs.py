@@ -1,5 +1,6 @@
 """Logging configuration for texmgr."""
 
+import functools
 import logging
 import sys
 from pathlib import Path
@@ -13,6 +14,8 @@ COLORS = {
     "RESET": "\033[0m",
 }
 
+logger = logging.getLogger("texmgr")
+
 
 class ColoredFormatter(logging.Formatter):
     """A custom formatter that adds colors to log messages based on level."""
@@ -38,14 +41,17 @@ class ColoredFormatter(logging.Formatter):
         str
             The formatted log message with color codes
         """
-        # Add color if the level is INFO or higher and we're not in debug mode
+        message = super().format(record)
+
+        # Color the formatted text; the record is shared with other handlers
         if record.levelno >= logging.INFO:
             color = self.LEVEL_COLORS.get(record.levelno, "")
-            record.msg = f"{color}{record.msg}{COLORS['RESET']}"
+            return f"{color}{message}{COLORS['RESET']}"
 
-        return super().format(record)
+        return message
 
 
+@functools.lru_cache(maxsize=1)
 def find_project_root() -> Optional[Path]:
     """
     Find the root directory of the current LaTeX project.
@@ -57,7 +63,8 @@ def find_project_root() -> Optional[Path]:
 
     Notes
     -----
-    Project root is identified by the presence of a main.tex file
+    Project root is identified by the presence of a main.tex file. The
+    result is cached for the lifetime of the process.
     """
     current = Path.cwd()
 
@@ -92,8 +99,6 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     - Logs are stored in project_root/output/logs/ if in a project,
       otherwise in ~/.texmgr/logs/
     """
-    logger = logging.getLogger("texmgr")
-
     # Set the logging level based on verbosity
     level = logging.DEBUG if verbose else logging.INFO
     logger.setLevel(level)
@@ -0,0 +1,103 @@
+"""Tests for the PDF up-to-date check in texmgr.builder.build."""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from texmgr.builder import build
+
+
+class BuildPdfDigestTest(unittest.TestCase):
+    """build_pdf must not record a digest for inputs edited mid-build."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.main_tex = self.root / "main.tex"
+        self.main_tex.write_text("v1\n")
+        self.bib = self.root / "refs" / "library.bib"
+        self.bib.parent.mkdir()
+        self.bib.write_text("@misc{a}\n")
+        self.bst = self.root / "local.bst"
+        self.bst.write_text("ENTRY {} {} {}\n")
+
+        # Saved well before any build starts
+        for path in (self.main_tex, self.bib, self.bst):
+            self.touch(path, time.time_ns() - 10 * 10**9)
+
+        self.layout = build.ProjectLayout(root=self.root, main_tex=self.main_tex)
+        self.calls = 0
+        self.edit_during_build = False
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    @staticmethod
+    def touch(path: Path, mtime_ns: int) -> None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    async def fake_latexmk(self, cmd, cwd=None, error_msg="", capture_output=True):
+        """Write the outputs latexmk would, optionally saving main.tex meanwhile."""
+        self.calls += 1
+        logs = self.root / "output" / "logs"
+
+        # pdflatex reads the .aux of the previous run and rewrites it, so it
+        # is listed as both INPUT and OUTPUT with a fresh mtime every run
+        (logs / "main.aux").write_text(
+            "\\relax\n\\bibstyle{local}\n\\bibdata{refs/library}\n"
+        )
+        (logs / "main.fls").write_text(
+            f"PWD {self.root}\n"
+            "INPUT main.tex\n"
+            f"INPUT {logs / 'main.aux'}\n"
+            f"OUTPUT {logs / 'main.aux'}\n"
+        )
+        (self.root / "output" / "pdf" / "main.pdf").write_text(self.main_tex.read_text())
+
+        if self.edit_during_build:
+            self.main_tex.write_text("v2\n")
+            self.touch(self.main_tex, time.time_ns())
+
+    def run_build(self):
+        with mock.patch.object(build, "check_command_exists", return_value=True), \
+                mock.patch.object(build, "run_command_async", self.fake_latexmk):
+            asyncio.run(build.build_pdf(self.layout))
+
+    def digest_file(self) -> Path:
+        return self.root / "output" / "logs" / build.INPUTS_DIGEST_FILE
+
+    def test_unchanged_inputs_skip_second_build(self):
+        self.run_build()
+        self.assertTrue(self.digest_file().exists())
+
+        self.run_build()
+        self.assertEqual(self.calls, 1)
+
+    def test_bibtex_inputs_from_aux_are_tracked(self):
+        self.run_build()
+
+        self.bib.write_text("@misc{a}\n@misc{b}\n")
+        self.run_build()
+        self.assertEqual(self.calls, 2)
+
+        self.bst.write_text("ENTRY {} {} {label}\n")
+        self.run_build()
+        self.assertEqual(self.calls, 3)
+
+    def test_edit_during_build_forces_rebuild(self):
+        self.edit_during_build = True
+        self.run_build()
+        self.assertFalse(self.digest_file().exists())
+
+        self.edit_during_build = False
+        self.run_build()
+        self.assertEqual(self.calls, 2)
+        self.assertEqual((self.root / "output" / "pdf" / "main.pdf").read_text(), "v2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()